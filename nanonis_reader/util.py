@@ -3,11 +3,109 @@ from pptx.util import Inches
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import re
 import glob
 import nanonis_reader as nr
-from mpl_toolkits.axes_grid1 import make_axes_locatable
 import io
+from PIL import Image
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import Normalize
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from nanonis_reader.find_value import nearest
+try:
+    from numba import njit  # optional (3 sigma 계산 가속)
+except ImportError:
+    njit = None
+
+# 파일 이름에서 확장자 바로 앞의 번호 (ex: Au111_xxx_0013.sxm -> 13, Au111_4.2K_0005.dat -> 5)
+_NUMBER_RE = re.compile(r'_(\d+)\.[^.]+$')
+# header 날짜 (일.월.년 또는 일.월.년 시:분:초)
+_DATE_RE = re.compile(r'^(\d{1,2})\.(\d{1,2})\.(\d{4})(?: (\S+))?$')
+
+# 파일 확장자별 load 함수 매핑 (NanonisData 생성마다 새로 만들지 않도록 module에서 한 번만)
+_FILE_HANDLERS = {
+    '.sxm': nr.nanonis_sxm.Load,
+    '.dat': nr.nanonis_dat.Load,
+    '.3ds': nr.nanonis_3ds.Load
+}
+
+# _render_map 이미지 크기 (px)
+_MAP_SIZE = 400          # map의 긴 변
+_CBAR_WIDTH = 90         # colorbar 이미지 전체 폭 (눈금 글자 포함)
+_CBAR_PAD = 8            # map과 colorbar 사이 간격
+_CBAR_BAR_WIDTH = 16     # colorbar 막대 폭
+_CBAR_MARGIN_TOP = 24    # 위쪽 여백 (scientific notation offset 글자)
+_CBAR_MARGIN_BOTTOM = 8  # 아래쪽 여백 (끝 눈금 글자)
+_CBAR_CACHE_SIZE = 16
+
+# savefig PNG 옵션: 빠른 압축 (zlib level 1, 기본값 6) + Software metadata 생략
+# (PPT에 그대로 삽입되므로 파일 크기보다 저장 속도가 중요)
+_PNG_SAVE_KWARGS = {'pil_kwargs': {'compress_level': 1}, 'metadata': {'Software': None}}
+
+# figure 여백 고정 (figure 크기 대비 비율, 축 label과 colorbar tick label이 잘리지 않는 값)
+# map은 aspect에 따라 빈 공간이 생기므로 넉넉하게 잡고 저장할 때 흰 여백을 잘라냄 (_savefig_cropped)
+_LINE_LAYOUT = {'left': 0.2, 'right': 0.95, 'bottom': 0.11, 'top': 0.95}
+_MAP_LAYOUT = {'left': 0.12, 'right': 0.8, 'bottom': 0.08, 'top': 0.92}
+
+# 슬라이드 배치 (EMU 단위로 미리 계산, 이미지 크기를 조금 줄여서 3개가 들어갈 수 있게 조정)
+_SLIDE_IMG_SIZE = Inches(3.2)
+_SLIDE_IMG_STEP = Inches(3.2 * 1.02)
+_SLIDE_IMG_TOP = Inches(1.5)
+_SLIDE_TEXT_LEFT = Inches(1)
+_SLIDE_TEXT_TOP = _SLIDE_IMG_TOP + _SLIDE_IMG_SIZE + Inches(0.2)  # 0.2인치 간격
+_SLIDE_TEXT_WIDTH = Inches(8)
+_SLIDE_TEXT_HEIGHT = Inches(0.5)
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _nan_mean_std(flat):
+        '''
+        nan을 제외한 평균, 표준편차를 한 번의 순회로 계산 (Welford)
+        '''
+        n = 0
+        mean = 0.0
+        m2 = 0.0
+        for i in range(flat.size):
+            v = flat[i]
+            if v == v:  # nan 제외
+                n += 1
+                delta = v - mean
+                mean += delta / n
+                m2 += delta * (v - mean)
+        if n == 0:
+            return np.nan, np.nan
+        return mean, np.sqrt(m2 / n)
+else:
+    def _nan_mean_std(flat):
+        return np.nanmean(flat), np.nanstd(flat)
+
+
+def _format_date(date_str):
+    '''
+    일.월.년 (시:분:초) 형식을 년.월.일(_시:분:초) 형식으로 변환
+    ex) '14.10.2026' -> '2026.10.14', '14.10.2026 12:00:00' -> '2026.10.14_12:00:00'
+    '''
+    match = _DATE_RE.match(date_str) if isinstance(date_str, str) else None
+    if match is None:
+        return date_str  # 파싱 실패시 원본 반환
+    day, month, year, time_part = match.groups()
+    if time_part:
+        return f"{year}.{month}.{day}_{time_part}"
+    return f"{year}.{month}.{day}"
+
+
+def _format_current(current):
+    '''
+    전류 값을 nA (1 nA 이상) 또는 pA 단위 문자열로 변환
+    '''
+    current = float(current)
+    if abs(current) >= 1e-9:
+        return f"{current*1e9:.0f} nA"
+    return f"{current*1e12:.0f} pA"
 
 
 class NanonisData:
@@ -17,13 +115,6 @@ class NanonisData:
         fine_number: file number (ex: 0015.sxm -> 15)
         keyword: file name filter (ex: Au111_xxx_0013.sxm -> 'Au')
         '''
-        # 파일 확장자별 함수 매핑
-        file_handlers = {
-            '.sxm': nr.nanonis_sxm.Load,
-            '.dat': nr.nanonis_dat.Load,
-            '.3ds': nr.nanonis_3ds.Load
-        }
-        
         # 파일 번호가 주어진 경우
         if isinstance(file_number, (int, str)):
             # 숫자를 4자리 문자열로 변환 (예: 16 -> '0016')
@@ -57,56 +148,76 @@ class NanonisData:
         _, extension = os.path.splitext(filepath)
         
         # 해당하는 함수 찾아서 실행
-        if extension in file_handlers:
-            data = file_handlers[extension](filepath)
-            # data의 모든 속성을 현재 객체(self)에 복사
-            for attr_name in dir(data):
-                if not attr_name.startswith('_'):  # private 속성은 제외
-                    setattr(self, attr_name, getattr(data, attr_name))
+        if extension in _FILE_HANDLERS:
+            data = _FILE_HANDLERS[extension](filepath)
+            # 자주 쓰는 속성만 직접 저장하고, 나머지는 __getattr__로 data에 위임
+            self._data = data
+            self.fname = data.fname
+            self.header = data.header
+            self.signals = data.signals
         else:
             raise ValueError(f"Unsupported file extension: {extension}")
 
+    def __getattr__(self, name):
+        # private 속성은 위임하지 않음 (_data가 없을 때의 무한 재귀 방지)
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._data, name)
+
+    @classmethod
+    def from_path(cls, filepath):
+        '''
+        filepath: 파일 경로 (glob 검색 없이 바로 로드)
+        '''
+        return cls(filepath)
+
 
 class DataToPPT:
-    def __init__(self, base_path, keyword=None, output_filename='output.pptx'):
+    def __init__(self, base_path, keyword=None, output_filename='output.pptx', max_workers=None):
         '''
         base_path: 파일들이 있는 경로
         keyword: 파일 이름 필터 (예: 'Au', 'SiCG')
         output_filename: 생성될 PPT 파일 이름
+        max_workers: 이미지 생성에 사용할 process 수 (None 또는 1이면 main process에서 순서대로 처리)
+                     2 이상이면 process pool 사용 -> script에서는 반드시 if __name__ == '__main__': 안에서
+                     generate_ppt 호출 (Windows, macOS의 spawn 방식은 worker마다 script를 다시 실행)
         '''
         self.base_path = base_path
         self.keyword = keyword
         self.output_filename = output_filename
+        self.max_workers = max_workers
         self.prs = Presentation()
+        self._title_only_layout = self.prs.slide_layouts[5]  # 제목만 있는 layout (슬라이드마다 찾지 않도록)
+        self._colorbar_cache = {}
+        self._lut_cache = {}
+        # colormap은 파일마다 새로 만들지 않고 한 번만 생성
+        self._nanox = nr.cmap_custom.nanox()
+        self._bwr = nr.cmap_custom.bwr()
+        # 파일 확장자별 (파라미터 추출, 이미지 생성, 정보 텍스트) 함수 매핑
+        self._handlers = {
+            '.sxm': (self.get_sxm_parameters, self.process_sxm_file, self.get_sxm_info_text),
+            '.dat': (self.get_dat_parameters, self.process_dat_file, self.get_dat_info_text),
+            '.3ds': (self.get_3ds_parameters, self.process_3ds_file, self.get_3ds_info_text),
+        }
+        # line plot용 figure (pyplot에 등록하지 않으므로 plt.close('all')의 영향을 받지 않음)
+        self._fig = Figure(figsize=(5, 5))
+        self._ax = self._fig.add_subplot(111)
+        self._fig.subplots_adjust(**_LINE_LAYOUT)
 
     def get_scan_parameters(self, data):
         '''
         파일 타입에 따라 적절한 파라미터 추출 함수 호출
         '''
-        if data.fname.endswith('.sxm'):
-            return self.get_sxm_parameters(data)
-        elif data.fname.endswith('.dat'):
-            return self.get_dat_parameters(data)
-        elif data.fname.endswith('.3ds'):
-            return self.get_3ds_parameters(data)
-        else:
+        _, extension = os.path.splitext(data.fname)
+        if extension not in self._handlers:
             raise ValueError(f"Unsupported file type: {data.fname}")
+        return self._handlers[extension][0](data)
 
     def get_sxm_parameters(self, data):
         '''
         header에서 자주 사용되는 파라미터들을 추출하는 함수
         반환값: pixels, scan_range, scan_dir, bias, current 등
         '''
-        def format_date(date_str):
-            '''
-            일.월.년 형식을 년.월.일 형식으로 변환
-            '''
-            try:
-                day, month, year = date_str.split('.')
-                return f"{year}.{month}.{day}"
-            except:
-                return date_str  # 파싱 실패시 원본 반환
-            
         params = {
             'pixels': data.header['scan_pixels'],
             'range': data.header['scan_range'],
@@ -115,7 +226,7 @@ class DataToPPT:
             'bias': data.header['bias>bias (v)'],
             'current': data.header['z-controller>setpoint'],
             'scan_time': data.header['rec_time'],
-            'scan_date': format_date(data.header['rec_date']),
+            'scan_date': _format_date(data.header['rec_date']),
         }
         params['aspect_ratio'] = (params['pixels'][0]/params['pixels'][1])*(params['range'][1]/params['range'][0])
         params['fname'] = data.fname
@@ -127,23 +238,6 @@ class DataToPPT:
         .dat 파일의 파라미터 추출
         Z rel (m) 포함 여부에 따라 다른 파라미터 반환
         '''
-        def format_date(date_str):
-            '''
-            일.월.년 시:분:초 형식을 년.월.일 시:분:초 형식으로 변환
-            '''
-            try:
-                # 날짜와 시간 분리
-                date_part, time_part = date_str.split(' ')
-                
-                # 날짜 부분 변환
-                day, month, year = date_part.split('.')
-                formatted_date = f"{year}.{month}.{day}"
-                
-                # 날짜와 시간 다시 합치기
-                return f"{formatted_date}_{time_part}"
-            except:
-                return date_str  # 파싱 실패시 원본 반환
-
         if 'Z rel (m)' in data.signals.keys():
             params = {
                 'bias': data.header['Bias>Bias (V)'],
@@ -164,7 +258,7 @@ class DataToPPT:
                     data.header.get('Comment') or
                     ''
                 ),
-                'saved_date': format_date(data.header['Saved Date']),
+                'saved_date': _format_date(data.header['Saved Date']),
             }
             # return params
         
@@ -173,7 +267,7 @@ class DataToPPT:
                 'bias': data.header['Bias>Bias (V)'],
                 'current': data.header['Z-Controller>Setpoint'],
                 'feedback': data.header['Z-Controller>Controller status'],
-                'saved_date': format_date(data.header['Saved Date']),
+                'saved_date': _format_date(data.header['Saved Date']),
                 'comment': (
                     data.header.get('Comment01') or
                     data.header.get('comment') or
@@ -191,7 +285,7 @@ class DataToPPT:
                     data.header.get('Comment') or
                     ''
                 ),
-                'saved_date': format_date(data.header['Saved Date']),
+                'saved_date': _format_date(data.header['Saved Date']),
             }
 
         elif data.header['Experiment'] == 'LongTerm Data':
@@ -203,7 +297,7 @@ class DataToPPT:
                     data.header.get('Comment') or
                     ''
                 ),
-                'saved_date': format_date(data.header['Saved Date']),
+                'saved_date': _format_date(data.header['Saved Date']),
             }
 
         else:
@@ -233,7 +327,7 @@ class DataToPPT:
                     data.header.get('Comment') or
                     ''
                 ),
-                'saved_date': format_date(data.header['Saved Date']),
+                'saved_date': _format_date(data.header['Saved Date']),
             }
         params['fname'] = data.fname
 
@@ -245,23 +339,6 @@ class DataToPPT:
         '''
         .3ds 파일의 파라미터 추출
         '''
-        def format_date(date_str):
-            '''
-            일.월.년 시:분:초 형식을 년.월.일 시:분:초 형식으로 변환
-            '''
-            try:
-                # 날짜와 시간 분리
-                date_part, time_part = date_str.split(' ')
-                
-                # 날짜 부분 변환
-                day, month, year = date_part.split('.')
-                formatted_date = f"{year}.{month}.{day}"
-                
-                # 날짜와 시간 다시 합치기
-                return f"{formatted_date}_{time_part}"
-            except:
-                return date_str  # 파싱 실패시 원본 반환
-            
         # params = {
         #         # 'bias': data.header['Bias>Bias (V)'],
         #         # 'current': data.header['Z-Controller>Setpoint'],
@@ -304,7 +381,7 @@ class DataToPPT:
                     data.header.get('Comment') or
                     ''
                 ),
-                'saved_date': format_date(data.header['start_time']),
+                'saved_date': _format_date(data.header['start_time']),
             }
 
         else:
@@ -332,7 +409,7 @@ class DataToPPT:
                     data.header.get('Comment') or
                     ''
                 ),
-                'saved_date': format_date(data.header['start_time']),
+                'saved_date': _format_date(data.header['start_time']),
             }
         params['aspect_ratio'] = (params['pixels'][0]/params['pixels'][1])*(params['range'][1]/params['range'][0])
         params['fname'] = data.fname
@@ -343,72 +420,41 @@ class DataToPPT:
         '''
         .sxm 파일의 정보 텍스트 생성
         '''
-        info_texts = []
-        info_texts.append(f"{params['fname']}\n")
-        info_texts.append(f"{float(params['bias'])} V /")
-        current = float(params['current'])
-        if abs(current) >= 1e-9:
-            # nA 단위로 표시
-            info_texts.append(f"{current*1e9:.0f} nA")
-        else:
-            # pA 단위로 표시
-            info_texts.append(f"{current*1e12:.0f} pA")
-        info_texts.append(f"\n{params['range'][0]*1e9:.0f} x {params['range'][1]*1e9:.0f} nm²")
-        info_texts.append(f"({params['direction']}, {float(params['angle']):.1f}˚)")
-        info_texts.append(f"\n({params['scan_date']}_{params['scan_time']})")
-        
-        return " ".join(info_texts)
+        return (f"{params['fname']}\n"
+                f"{float(params['bias'])} V / {_format_current(params['current'])}\n"
+                f"{params['range'][0]*1e9:.0f} x {params['range'][1]*1e9:.0f} nm² "
+                f"({params['direction']}, {float(params['angle']):.1f}˚)\n"
+                f"({params['scan_date']}_{params['scan_time']})")
 
     def get_dat_info_text(self, params):
         '''
         .dat 파일의 정보 텍스트 생성
         '''
         if 'sweep_z' in params:
-            info_texts = []
-            info_texts.append(f"{params['fname']}\n")
-            info_texts.append(f"{float(params['bias'])} V /")
-            current = float(params['current'])
-            if abs(current) >= 1e-9:
-                # nA 단위로 표시
-                info_texts.append(f"{current*1e9:.0f} nA")
-            else:
-                # pA 단위로 표시
-                info_texts.append(f"{current*1e12:.0f} pA")
-            info_texts.append(f"\nComment: {params['comment']}")    
-            info_texts.append(f"\n({params['saved_date']})")
+            return (f"{params['fname']}\n"
+                    f"{float(params['bias'])} V / {_format_current(params['current'])}\n"
+                    f"Comment: {params['comment']}\n"
+                    f"({params['saved_date']})")
         elif 'feedback' in params:
-            info_texts = []
-            info_texts.append(f"{params['fname']}\n")
-            info_texts.append(f"Comment: {params['comment']}")
-            info_texts.append(f"\n({params['saved_date']})")
+            return (f"{params['fname']}\n"
+                    f"Comment: {params['comment']}\n"
+                    f"({params['saved_date']})")
         elif 'history' in params:
-            info_texts = []
-            info_texts.append(f"{params['fname']}\n")
-            info_texts.append(f"{params['history']}")
-            info_texts.append(f"\nComment: {params['comment']}")
-            info_texts.append(f"\n({params['saved_date']})")
+            return (f"{params['fname']}\n"
+                    f"{params['history']}\n"
+                    f"Comment: {params['comment']}\n"
+                    f"({params['saved_date']})")
         elif 'long term chart' in params:
-            info_texts = []
-            info_texts.append(f"{params['fname']}\n")
-            info_texts.append(f"{params['long term chart']}")
-            info_texts.append(f"\nComment: {params['comment']}")
-            info_texts.append(f"\n({params['saved_date']})")
+            return (f"{params['fname']}\n"
+                    f"{params['long term chart']}\n"
+                    f"Comment: {params['comment']}\n"
+                    f"({params['saved_date']})")
         else:
-            info_texts = []
-            info_texts.append(f"{params['fname']}\n")
-            info_texts.append(f"{float(params['bias'])} V /")
-            current = float(params['current'])
-            if abs(current) >= 1e-9:
-                # nA 단위로 표시
-                info_texts.append(f"{current*1e9:.0f} nA")
-            else:
-                # pA 단위로 표시
-                info_texts.append(f"{current*1e12:.0f} pA")
-            info_texts.append(f"\n{float(params['sweep_start'])} V to {float(params['sweep_end'])} V (sweeps: {params['sweep_num']})")
-            info_texts.append(f"\nComment: {params['comment']}")
-            info_texts.append(f"\n({params['saved_date']})")
-        
-        return " ".join(info_texts)
+            return (f"{params['fname']}\n"
+                    f"{float(params['bias'])} V / {_format_current(params['current'])}\n"
+                    f"{float(params['sweep_start'])} V to {float(params['sweep_end'])} V (sweeps: {params['sweep_num']})\n"
+                    f"Comment: {params['comment']}\n"
+                    f"({params['saved_date']})")
 
     def get_3ds_info_text(self, params):
         '''
@@ -417,179 +463,217 @@ class DataToPPT:
         # .3ds 파일에 맞는 정보 포맷
         # For I-z grid,
         if 'sweep_z' in params:
-            info_texts = []
-            info_texts.append(f"{params['fname']}\n") # Data name
-            info_texts.append(f"I-z spectroscopy grid\n") # "I-z spectrum"
-            info_texts.append(f"{float(params['bias'])} V /" if params.get('bias') else 'Set bias was not saved.\n') # set bias
-            if params.get('current'):
-                current = float(params['current'])
-                if abs(current) >= 1e-9: # set current
-                    # nA 단위로 표시
-                    info_texts.append(f"{current*1e9:.0f} nA")
-                else:
-                    # pA 단위로 표시
-                    info_texts.append(f"{current*1e12:.0f} pA")
-            else:
-                info_texts.append('Set point current was not saved.\n')
-            # size (angle)
+            bias = f"{float(params['bias'])} V" if params.get('bias') else 'Set bias was not saved.' # set bias
+            current = _format_current(params['current']) if params.get('current') else 'Set point current was not saved.' # set current
             # sweep $\Delta z$, number of sweep
             if params.get('offset') and params.get('sweep_z'):
-                info_texts.append(f"\n{float(params['offset'])*1e12:.0f} pm to {(float(params['offset'])+float(params['sweep_z']))*1e12:.0f} pm (sweeps: {params['sweep_num']})")
+                offset = float(params['offset'])
+                sweep_range = f"{offset*1e12:.0f} pm to {(offset+float(params['sweep_z']))*1e12:.0f} pm (sweeps: {params['sweep_num']})"
             else:
-                info_texts.append('Z sweep range was not saved.\n')
-            info_texts.append(f"\n{params['range'][0]*1e9:.0f} x {params['range'][1]*1e9:.0f} nm²")
-            info_texts.append(f"({float(params['angle']):.1f}˚)")
-            info_texts.append(f"\nComment: {params['comment']}")    
-            info_texts.append(f"\n({params['saved_date']})")
+                sweep_range = 'Z sweep range was not saved.'
+            return (f"{params['fname']}\n" # Data name
+                    f"I-z spectroscopy grid\n" # "I-z spectrum"
+                    f"{bias} / {current}\n"
+                    f"{sweep_range}\n"
+                    f"{params['range'][0]*1e9:.0f} x {params['range'][1]*1e9:.0f} nm² ({float(params['angle']):.1f}˚)\n" # size (angle)
+                    f"Comment: {params['comment']}\n"
+                    f"({params['saved_date']})")
 
         # For STS grid,
         else:
-            info_texts = []
-            info_texts.append(f"{params['fname']}\n")
-            info_texts.append(f"STS grid\n") # "STS"
-            info_texts.append(f"{float(params['bias'])} V /")
-            current = float(params['current'])
-            if abs(current) >= 1e-9:
-                # nA 단위로 표시
-                info_texts.append(f"{current*1e9:.0f} nA")
-            else:
-                # pA 단위로 표시
-                info_texts.append(f"{current*1e12:.0f} pA")
-            info_texts.append(f"\n{float(params['sweep_start'])} V to {float(params['sweep_end'])} V (sweeps: {params['sweep_num']})")
-            info_texts.append(f"\n{params['range'][0]*1e9:.0f} x {params['range'][1]*1e9:.0f} nm²")
-            info_texts.append(f"({float(params['angle']):.1f}˚)")
-            info_texts.append(f"\nComment: {params['comment']}")
-            info_texts.append(f"\n({params['saved_date']})")
-
-        # return "3DS file parameters"
-        return " ".join(info_texts)
+            return (f"{params['fname']}\n"
+                    f"STS grid\n" # "STS"
+                    f"{float(params['bias'])} V / {_format_current(params['current'])}\n"
+                    f"{float(params['sweep_start'])} V to {float(params['sweep_end'])} V (sweeps: {params['sweep_num']})\n"
+                    f"{params['range'][0]*1e9:.0f} x {params['range'][1]*1e9:.0f} nm² ({float(params['angle']):.1f}˚)\n"
+                    f"Comment: {params['comment']}\n"
+                    f"({params['saved_date']})")
 
     def get_3sigma_limits(self, data):
-        mean = np.nanmean(data)
-        sigma = np.nanstd(data)
+        flat = np.ravel(data)
+        # .sxm raw data는 big endian (>f4) -> native byte order로 변환 (numba는 native만 지원)
+        flat = flat.astype(flat.dtype.newbyteorder('='), copy=False)
+        mean, sigma = _nan_mean_std(flat)
         return mean + np.array([-3, 3]) * sigma
 
-    def process_sxm_file(self, data):
+    def _savefig(self, fig):
+        '''
+        figure를 PNG 이미지 (bytes)로 저장
+        (layout은 _LINE_LAYOUT으로 고정 -> bbox_inches='tight'의 추가 draw pass 생략)
+        '''
+        img_stream = io.BytesIO()
+        fig.savefig(img_stream, format='png', **_PNG_SAVE_KWARGS)
+        return img_stream.getvalue()
+
+    def _savefig_cropped(self, fig, pad=4):
+        '''
+        figure를 한 번만 그린 뒤 흰 여백을 잘라내어 PNG 이미지 (bytes)로 저장
+        (bbox_inches='tight'와 같은 결과, aspect가 1이 아닌 map도 이미지 전체를 채움)
+        pad: 잘라낸 뒤 남길 여백 (px)
+        '''
+        canvas = FigureCanvasAgg(fig)
+        canvas.draw()
+        rgba = np.asarray(canvas.buffer_rgba())
+        content = (rgba[..., :3] != 255).any(axis=-1)
+        rows = np.flatnonzero(content.any(axis=1))
+        cols = np.flatnonzero(content.any(axis=0))
+        if rows.size:
+            rgba = rgba[max(rows[0] - pad, 0):rows[-1] + pad + 1,
+                        max(cols[0] - pad, 0):cols[-1] + pad + 1]
+
+        img_stream = io.BytesIO()
+        Image.fromarray(rgba).convert('RGB').save(img_stream, format='PNG', compress_level=1)
+        return img_stream.getvalue()
+
+    def _colorbar_image(self, cmap, vmin, vmax, height, sci_notation=False):
+        '''
+        map 옆에 붙일 colorbar 이미지 (PIL) 생성
+        같은 (cmap, vmin, vmax, height) 조합은 다시 그리지 않고 재사용
+        '''
+        key = (cmap.name, vmin, vmax, height, sci_notation)
+        if key not in self._colorbar_cache:
+            dpi = 100
+            total_height = height + _CBAR_MARGIN_TOP + _CBAR_MARGIN_BOTTOM
+            fig = Figure(figsize=(_CBAR_WIDTH / dpi, total_height / dpi), dpi=dpi)
+            cax = fig.add_axes([_CBAR_PAD / _CBAR_WIDTH, _CBAR_MARGIN_BOTTOM / total_height,
+                                _CBAR_BAR_WIDTH / _CBAR_WIDTH, height / total_height])
+            cbar = fig.colorbar(ScalarMappable(norm=Normalize(vmin, vmax), cmap=cmap), cax=cax)
+            if sci_notation:
+                cbar.formatter.set_powerlimits((-3, 4))  # scientific notation 사용 범위 설정
+                cbar.update_ticks()
+            cax.yaxis.get_offset_text().set_horizontalalignment('left')  # 왼쪽 잘림 방지
+
+            img_stream = io.BytesIO()
+            fig.savefig(img_stream, format='png', dpi=dpi, **_PNG_SAVE_KWARGS)
+            img_stream.seek(0)
+
+            # 오래된 것부터 삭제 (batch 전체에서 메모리가 계속 늘어나지 않도록)
+            if len(self._colorbar_cache) >= _CBAR_CACHE_SIZE:
+                self._colorbar_cache.pop(next(iter(self._colorbar_cache)))
+            self._colorbar_cache[key] = Image.open(img_stream).convert('RGBA')
+
+        return self._colorbar_cache[key]
+
+    def _colormap_lut(self, cmap):
+        '''
+        colormap의 RGBA uint8 lookup table과 under, over, bad 색 반환 (colormap별로 한 번만 계산)
+        '''
+        if cmap.name not in self._lut_cache:
+            self._lut_cache[cmap.name] = (cmap(np.arange(cmap.N), bytes=True),
+                                          cmap(-1, bytes=True),
+                                          cmap(cmap.N, bytes=True),
+                                          cmap(np.nan, bytes=True))
+        return self._lut_cache[cmap.name]
+
+    def _render_map(self, z_data, cmap, origin, aspect, sci_notation=False):
+        '''
+        2D map을 matplotlib figure 없이 colormap만 적용하여 PNG 이미지 (bytes)로 변환
+        (imshow(..., vmin, vmax = 3 sigma, interpolation='none') + colorbar 와 같은 역할)
+        '''
+        vmin, vmax = self.get_3sigma_limits(z_data)
+
+        # colormap 적용: z -> LUT index (uint8) -> RGBA uint8
+        # (cmap(Normalize(vmin, vmax)(z), bytes=True)와 같은 결과, 범위 밖은 under/over, nan은 bad 색)
+        lut, under, over, bad = self._colormap_lut(cmap)
+        n = len(lut)
+        scale = n / (vmax - vmin) if vmax > vmin else 0.0
+        xa = np.subtract(z_data, vmin, dtype=np.float64)
+        xa *= scale
+        bad_mask = np.isnan(xa)
+        under_mask = xa < 0
+        over_mask = xa > n
+        np.clip(xa, 0, n - 1, out=xa)
+        xa[bad_mask] = 0
+        rgba = lut[xa.astype(np.uint8 if n <= 256 else np.uint16)]
+        rgba[under_mask] = under
+        rgba[over_mask] = over
+        rgba[bad_mask] = bad
+        if origin == 'lower':
+            rgba = rgba[::-1]
+        image = Image.fromarray(rgba, 'RGBA')
+
+        # pixel 비율 (aspect) 반영하여 확대, interpolation='none'과 같게 NEAREST 사용
+        lines, pixels = np.shape(z_data)
+        height = lines * aspect
+        scale = _MAP_SIZE / max(pixels, height)
+        size = (max(1, round(pixels * scale)), max(1, round(height * scale)))
+        image = image.resize(size, Image.NEAREST)
+
+        cbar = self._colorbar_image(cmap, vmin, vmax, size[1], sci_notation)
+        canvas = Image.new('RGBA', (size[0] + cbar.width, cbar.height), 'white')
+        canvas.alpha_composite(image, (0, _CBAR_MARGIN_TOP))
+        canvas.alpha_composite(cbar, (size[0], 0))
+
+        img_stream = io.BytesIO()
+        canvas.convert('RGB').save(img_stream, format='PNG', compress_level=1)
+        return img_stream.getvalue()
+
+    def process_sxm_file(self, data, params=None):
         '''
         .sxm 파일 처리 함수
+        params: get_sxm_parameters(data) 결과 (이미 계산했다면 전달하여 중복 추출 방지)
         '''
-        params = self.get_scan_parameters(data)
+        if params is None:
+            params = self.get_sxm_parameters(data)
 
-        base_size = 5
-        figsize = (base_size, base_size)
+        topo = nr.nanonis_sxm.topography(data)
+        origin = 'upper' if params['direction'] == 'down' else 'lower'
+
+        # raw data는 한 번만 읽고 (native float64로 한 번만 변환) 두 이미지에서 공유
+        raw = np.asarray(topo.get_z('raw', 'fwd'), dtype=float)
 
         # 첫 번째 이미지 (topography)
-        fig = plt.figure(figsize=figsize)
-        ax = fig.add_subplot(111)      
-        
-        topo = nr.nanonis_sxm.topography(data)
-        z_data = topo.get_z('subtract linear fit', 'fwd')
+        z_data = nr.image_processing.subtract_linear_fit(raw)
+        img_stream1 = self._render_map(z_data, self._nanox, origin, params['aspect_ratio'])
 
-        origin = 'upper' if params['direction'] == 'down' else 'lower'
-        vmin, vmax = self.get_3sigma_limits(z_data)
-        nanox = nr.cmap_custom.nanox()
-        bwr = nr.cmap_custom.bwr()
-        
-        # 이미지 플롯
-        im = ax.imshow(z_data, origin=origin, vmin=vmin, vmax=vmax, 
-                    aspect=params['aspect_ratio'], cmap=nanox, interpolation='none')
-
-        # colorbar 추가
-        plt.draw()
-        posn = ax.get_position()
-        cax = fig.add_axes([posn.x1 + 0.01, posn.y0, 
-                            0.02, posn.height])
-        plt.colorbar(im, cax=cax)
-
-        # figure를 이미지로 저장
-        img_stream1 = io.BytesIO()
-        plt.savefig(img_stream1, format='png', bbox_inches='tight', pad_inches=0.01)
-        img_stream1.seek(0)
-        # plt.close('all')
-
-        # 두 번째 이미지 (differentiated)
-        fig = plt.figure(figsize=figsize)
-        ax = fig.add_subplot(111)
-        
-        z_data_diff = topo.get_z('differentiate', 'fwd')
-        vmin, vmax = self.get_3sigma_limits(z_data_diff)
-        im = ax.imshow(z_data_diff, origin=origin, vmin=vmin, vmax=vmax, 
-                    aspect=params['aspect_ratio'], cmap=nanox, interpolation='none')
-
-        # plt.draw()
-        # posn = ax.get_position()
-        # cax = fig.add_axes([posn.x1 + 0.01, posn.y0, 0.02, posn.height])
-        # plt.colorbar(im, cax=cax)
-
-        plt.draw()
-        posn = ax.get_position()
-        cax = fig.add_axes([posn.x1 + 0.01, posn.y0, 0.02, posn.height])
-        cbar = plt.colorbar(im, cax=cax)
-        cbar.formatter.set_powerlimits((-3, 4))  # scientific notation 사용 범위 설정
-        cbar.update_ticks()
-
-        img_stream2 = io.BytesIO()
-        plt.savefig(img_stream2, format='png', bbox_inches='tight', pad_inches=0.01)
-        img_stream2.seek(0)
-        # plt.close('all')
+        # 두 번째 이미지 (differentiated, topography.differentiate와 같은 dx)
+        dx = round(data.header['scan_range'][0] * 1e9) * 1e-9 / int(data.header['scan>pixels/line'])
+        z_data_diff = nr.image_processing.differentiate(raw, dx)
+        img_stream2 = self._render_map(z_data_diff, self._nanox, origin, params['aspect_ratio'], sci_notation=True)
 
         if 'LI_Demod_1_X' in data.signals.keys():
-            fig = plt.figure(figsize=figsize)
-            ax = fig.add_subplot(111)
-
             didv = nr.nanonis_sxm.didvmap(data)
             didv_data = didv.get_map()
-            vmin, vmax = self.get_3sigma_limits(didv_data)
-            im = ax.imshow(didv_data, origin=origin, vmin=vmin, vmax=vmax, 
-                        aspect=params['aspect_ratio'], cmap=bwr, interpolation='none')
-
-            plt.draw()
-            posn = ax.get_position()
-            cax = fig.add_axes([posn.x1 + 0.01, posn.y0, 0.02, posn.height])
-            plt.colorbar(im, cax=cax)
-
-            img_stream3 = io.BytesIO()
-            plt.savefig(img_stream3, format='png', bbox_inches='tight', pad_inches=0.01)
-            img_stream3.seek(0)
-            # plt.close('all')
+            img_stream3 = self._render_map(didv_data, self._bwr, origin, params['aspect_ratio'])
             
             return img_stream1, img_stream2, img_stream3
 
         return img_stream1, img_stream2
     
-    def process_dat_file(self, data):
+    def _line_axes(self):
+        '''
+        line plot용 figure/axes를 매번 새로 만들지 않고 초기화하여 재사용
+        '''
+        self._ax.cla()
+        return self._ax
+
+    def process_dat_file(self, data, params=None):
         '''
         .dat 파일 처리 함수
+        params: get_dat_parameters(data) 결과 (이미 계산했다면 전달하여 중복 추출 방지)
         '''
-        params = self.get_dat_parameters(data)
-        base_size = 5
-        figsize = (base_size, base_size)
+        if params is None:
+            params = self.get_dat_parameters(data)
 
         if 'sweep_z' in params:
             spec = nr.nanonis_dat.z_spectrum(data)
 
             # Z-I linear
             spec_z = spec.get_iz()
-            fig = plt.figure(figsize=figsize)
-            plt.plot(spec_z[0] * 1e9, spec_z[1] * 1e9, 'k-')
-            plt.xlabel('Z (nm)')
-            plt.ylabel('Current (nA)')
-            img_stream1 = io.BytesIO()
-            plt.savefig(img_stream1, format='png', bbox_inches='tight', pad_inches=0.1)
-            img_stream1.seek(0)
-            # plt.close('all')
+            ax = self._line_axes()
+            ax.plot(spec_z[0] * 1e9, spec_z[1] * 1e9, 'k-')
+            ax.set_xlabel('Z (nm)')
+            ax.set_ylabel('Current (nA)')
+            img_stream1 = self._savefig(self._fig)
 
             # Z-I log
-            fig = plt.figure(figsize=figsize)
-            plt.plot(spec_z[0] * 1e9, np.abs(spec_z[1] * 1e9), 'k-')
-            plt.xlabel('Z (nm)')
-            plt.ylabel('|Current| (nA)')
-            plt.yscale('log')
-            plt.grid(True)
-            img_stream2 = io.BytesIO()
-            plt.savefig(img_stream2, format='png', bbox_inches='tight', pad_inches=0.1)
-            img_stream2.seek(0)
-            # plt.close('all')
+            ax = self._line_axes()
+            ax.plot(spec_z[0] * 1e9, np.abs(spec_z[1] * 1e9), 'k-')
+            ax.set_xlabel('Z (nm)')
+            ax.set_ylabel('|Current| (nA)')
+            ax.set_yscale('log')
+            ax.grid(True)
+            img_stream2 = self._savefig(self._fig)
 
             return img_stream1, img_stream2
         
@@ -598,21 +682,20 @@ class DataToPPT:
 
             # Noise spectrum
             spec_noise = spec.get_noise()
+            ax = self._line_axes()
             if 'Current PSD (A/sqrt(Hz))' in data.signals.keys():
-                plt.plot(spec_noise[0], spec_noise[1]*1e15, 'k-')
-                plt.xlabel('Frequency (Hz)')
-                plt.ylabel('Current (fA)')
-                plt.yscale('log')
-                plt.grid(True)
+                ax.plot(spec_noise[0], spec_noise[1]*1e15, 'k-')
+                ax.set_xlabel('Frequency (Hz)')
+                ax.set_ylabel('Current (fA)')
+                ax.set_yscale('log')
+                ax.grid(True)
             else:
-                plt.plot(spec_noise[0], spec_noise[1]*1e12, 'k-')
-                plt.xlabel('Frequency (Hz)')
-                plt.ylabel('Z (pm)')
-                plt.yscale('log')
-                plt.grid(True)
-            img_stream1 = io.BytesIO()
-            plt.savefig(img_stream1, format='png', bbox_inches='tight', pad_inches=0.1)
-            img_stream1.seek(0)
+                ax.plot(spec_noise[0], spec_noise[1]*1e12, 'k-')
+                ax.set_xlabel('Frequency (Hz)')
+                ax.set_ylabel('Z (pm)')
+                ax.set_yscale('log')
+                ax.grid(True)
+            img_stream1 = self._savefig(self._fig)
 
             return img_stream1
 
@@ -621,27 +704,21 @@ class DataToPPT:
 
             # Current history
             hist_I = hist.get_history('Current (A)')
-            fig = plt.figure(figsize=figsize)
-            plt.plot(hist_I[0] * 1e-3, hist_I[1] * 1e9, 'k-')
-            plt.xlabel('Time (s)')
-            plt.ylabel('Current (nA)')
-            img_stream1 = io.BytesIO()
-            plt.savefig(img_stream1, format='png', bbox_inches='tight', pad_inches=0.1)
-            img_stream1.seek(0)
-            # plt.close('all')
+            ax = self._line_axes()
+            ax.plot(hist_I[0] * 1e-3, hist_I[1] * 1e9, 'k-')
+            ax.set_xlabel('Time (s)')
+            ax.set_ylabel('Current (nA)')
+            img_stream1 = self._savefig(self._fig)
 
             # Height history
             hist_z = hist.get_history('Z (m)')
-            fig = plt.figure(figsize=figsize)
-            plt.plot(hist_z[0] * 1e-3, hist_z[1] * 1e9, 'k-')
-            plt.xlabel('Time (s)')
-            plt.ylabel('Z (nm)')
-            # plt.yscale('log')
-            # plt.grid(True)
-            img_stream2 = io.BytesIO()
-            plt.savefig(img_stream2, format='png', bbox_inches='tight', pad_inches=0.1)
-            img_stream2.seek(0)
-            # plt.close('all')
+            ax = self._line_axes()
+            ax.plot(hist_z[0] * 1e-3, hist_z[1] * 1e9, 'k-')
+            ax.set_xlabel('Time (s)')
+            ax.set_ylabel('Z (nm)')
+            # ax.set_yscale('log')
+            # ax.grid(True)
+            img_stream2 = self._savefig(self._fig)
 
             return img_stream1, img_stream2
 
@@ -649,14 +726,11 @@ class DataToPPT:
             LTchart = nr.nanonis_dat.longterm_data(data)
 
             t_LTchart, z_LTchart = LTchart.get_z_longterm_chart()
-            fig = plt.figure(figsize=figsize)
-            plt.plot(t_LTchart, z_LTchart * 1e9, 'k-')
-            plt.xlabel('Rel. Time (s)')
-            plt.ylabel('Z (nm)')
-            img_stream1 = io.BytesIO()
-            plt.savefig(img_stream1, format='png', bbox_inches='tight', pad_inches=0.1)
-            img_stream1.seek(0)
-            # plt.close('all')
+            ax = self._line_axes()
+            ax.plot(t_LTchart, z_LTchart * 1e9, 'k-')
+            ax.set_xlabel('Rel. Time (s)')
+            ax.set_ylabel('Z (nm)')
+            img_stream1 = self._savefig(self._fig)
 
             return img_stream1
 
@@ -668,36 +742,27 @@ class DataToPPT:
             if np.any(signs < 0) and np.any(signs > 0):
                 # Scaled dI/dV
                 didv_scaled = spec.didv_scaled()
-                fig = plt.figure(figsize=figsize)
-                plt.plot(didv_scaled[0], didv_scaled[1] * 1e9, 'k-')
-                plt.xlabel('Bias (V)')
-                plt.ylabel('dI/dV (nS)')
-                img_stream1 = io.BytesIO()
-                plt.savefig(img_stream1, format='png', bbox_inches='tight', pad_inches=0.1)
-                img_stream1.seek(0)
-                # plt.close('all')
+                ax = self._line_axes()
+                ax.plot(didv_scaled[0], didv_scaled[1] * 1e9, 'k-')
+                ax.set_xlabel('Bias (V)')
+                ax.set_ylabel('dI/dV (nS)')
+                img_stream1 = self._savefig(self._fig)
 
                 # Normalized dI/dV
                 didv_norm = spec.didv_normalized()
-                fig = plt.figure(figsize=figsize)
-                plt.plot(didv_norm[0], didv_norm[1], 'k-')
-                plt.xlabel('Bias (V)')
-                plt.ylabel('Norm. dI/dV')
-                img_stream2 = io.BytesIO()
-                plt.savefig(img_stream2, format='png', bbox_inches='tight', pad_inches=0.1)
-                img_stream2.seek(0)
-                # plt.close('all')
+                ax = self._line_axes()
+                ax.plot(didv_norm[0], didv_norm[1], 'k-')
+                ax.set_xlabel('Bias (V)')
+                ax.set_ylabel('Norm. dI/dV')
+                img_stream2 = self._savefig(self._fig)
 
                 # I-V
-                fig = plt.figure(figsize=figsize)
+                ax = self._line_axes()
                 iv = spec.iv_raw()
-                plt.plot(iv[0], iv[1] * 1e12, 'k-')
-                plt.xlabel('Bias (V)')
-                plt.ylabel('Current (pA)')
-                img_stream3 = io.BytesIO()
-                plt.savefig(img_stream3, format='png', bbox_inches='tight', pad_inches=0.1)
-                img_stream3.seek(0)
-                # plt.close('all')
+                ax.plot(iv[0], iv[1] * 1e12, 'k-')
+                ax.set_xlabel('Bias (V)')
+                ax.set_ylabel('Current (pA)')
+                img_stream3 = self._savefig(self._fig)
 
 
                 return img_stream1, img_stream2, img_stream3
@@ -705,83 +770,68 @@ class DataToPPT:
             else:
                 # dI/dV raw
                 didv_raw = spec.didv_raw()
-                fig = plt.figure(figsize=figsize)
-                plt.plot(didv_raw[0], didv_raw[1] * 1e12, 'k-')
-                plt.xlabel('Bias (V)')
-                plt.ylabel('dI/dV (arb.)')
-                img_stream1 = io.BytesIO()
-                plt.savefig(img_stream1, format='png', bbox_inches='tight', pad_inches=0.1)
-                img_stream1.seek(0)
-                # plt.close('all')
+                ax = self._line_axes()
+                ax.plot(didv_raw[0], didv_raw[1] * 1e12, 'k-')
+                ax.set_xlabel('Bias (V)')
+                ax.set_ylabel('dI/dV (arb.)')
+                img_stream1 = self._savefig(self._fig)
 
                 # I-V
                 iv = spec.iv_raw()
-                fig = plt.figure(figsize=figsize)
-                plt.plot(iv[0], iv[1] * 1e12, 'k-')
-                plt.xlabel('Bias (V)')
-                plt.ylabel('Current (pA)')
-                img_stream2 = io.BytesIO()
-                plt.savefig(img_stream2, format='png', bbox_inches='tight', pad_inches=0.1)
-                img_stream2.seek(0)
-                # plt.close('all')
+                ax = self._line_axes()
+                ax.plot(iv[0], iv[1] * 1e12, 'k-')
+                ax.set_xlabel('Bias (V)')
+                ax.set_ylabel('Current (pA)')
+                img_stream2 = self._savefig(self._fig)
 
                 if 'Z (m)' in data.signals.keys():
                     # dZ/dV
                     dzdv = spec.dzdv_numerical()
-                    fig = plt.figure(figsize=figsize)
-                    plt.plot(dzdv[0], dzdv[1], 'k-')
-                    plt.xlabel('Bias (V)')
-                    plt.ylabel('dZ/dV (nm/V)')
-                    img_stream3 = io.BytesIO()
-                    plt.savefig(img_stream3, format='png', bbox_inches='tight', pad_inches=0.1)
-                    img_stream3.seek(0)
-                    # plt.close('all')
+                    ax = self._line_axes()
+                    ax.plot(dzdv[0], dzdv[1], 'k-')
+                    ax.set_xlabel('Bias (V)')
+                    ax.set_ylabel('dZ/dV (nm/V)')
+                    img_stream3 = self._savefig(self._fig)
 
                     return img_stream1, img_stream2, img_stream3
                 
                 return img_stream1, img_stream2
 
     
-    def process_3ds_file(self, data):
+    def process_3ds_file(self, data, params=None):
         '''
         .3ds 파일 처리 함수
+        params: get_3ds_parameters(data) 결과 (이미 계산했다면 전달하여 중복 추출 방지)
         '''
-        params = self.get_3ds_parameters(data)
+        if params is None:
+            params = self.get_3ds_parameters(data)
         base_size = 5
         figsize = (base_size, base_size)
         
         # For I-z spectra,
         if 'sweep_z' in params:
             # 첫 번째 이미지 (topography)
-            fig = plt.figure(figsize=figsize)
-            ax = fig.add_subplot(111)      
+            fig = Figure(figsize=figsize)
+            ax = fig.subplots(gridspec_kw=_MAP_LAYOUT)
             topo = nr.nanonis_3ds.Topo(data)
             z_data = topo.get_z ('subtract linear fit')
             origin = 'lower'
             vmin, vmax = self.get_3sigma_limits(z_data)
-            nanox = nr.cmap_custom.nanox()
-            bwr = nr.cmap_custom.bwr()
             
             # 이미지 플롯
             im = ax.imshow(z_data, origin=origin, vmin=vmin, vmax=vmax, 
-                        aspect=params['aspect_ratio'], cmap=nanox, interpolation='none')
+                        aspect=params['aspect_ratio'], cmap=self._nanox, interpolation='none')
 
             # colorbar 추가
-            plt.draw()
-            posn = ax.get_position()
-            cax = fig.add_axes([posn.x1 + 0.01, posn.y0, 
-                                0.02, posn.height])
-            plt.colorbar(im, cax=cax)
+            cax = ax.inset_axes([1.02, 0, 0.04, 1])  # aspect 적용 후의 axes 위치를 따라감
+            fig.colorbar(im, cax=cax)
 
             # figure를 이미지로 저장
-            img_stream1 = io.BytesIO()
-            plt.savefig(img_stream1, format='png', bbox_inches='tight', pad_inches=0.01)
-            img_stream1.seek(0)
-            # plt.close('all')
+            img_stream1 = self._savefig_cropped(fig)
 
             # 두 번째 이미지 (current map)
-            fig = plt.figure(figsize=figsize)
-            ax = fig.add_subplot(111)
+            fig = Figure(figsize=figsize)
+            ax = fig.subplots(gridspec_kw=_MAP_LAYOUT)
             spec = nr.nanonis_3ds.Map(data)
 
             idx = (nearest (spec.signals['sweep_signal'], -100e-12)[0])
@@ -789,79 +839,61 @@ class DataToPPT:
             spec_z = spec.get_currentmap (sweep_idx=idx)
             vmin, vmax = self.get_3sigma_limits(spec_z)
             im = ax.imshow(spec_z, origin=origin, vmin=vmin, vmax=vmax, 
-                        aspect=params['aspect_ratio'], cmap=nanox, interpolation='none')
+                        aspect=params['aspect_ratio'], cmap=self._nanox, interpolation='none')
 
             # colorbar 추가
-            plt.draw()
-            posn = ax.get_position()
-            cax = fig.add_axes([posn.x1 + 0.01, posn.y0, 0.02, posn.height])
-            cbar = plt.colorbar(im, cax=cax)
+            cax = ax.inset_axes([1.02, 0, 0.04, 1])  # aspect 적용 후의 axes 위치를 따라감
+            cbar = fig.colorbar(im, cax=cax)
             cbar.formatter.set_powerlimits((-3, 4))  # scientific notation 사용 범위 설정
             cbar.update_ticks()
 
             # figure를 이미지로 저장
-            img_stream2 = io.BytesIO()
-            plt.savefig(img_stream2, format='png', bbox_inches='tight', pad_inches=0.01)
-            img_stream2.seek(0)
-            # plt.close('all')
+            img_stream2 = self._savefig_cropped(fig)
 
             # 세 번째 이미지 (barrier map)
-            fig = plt.figure(figsize=figsize)
-            ax = fig.add_subplot(111)
+            fig = Figure(figsize=figsize)
+            ax = fig.subplots(gridspec_kw=_MAP_LAYOUT)
             spec = nr.nanonis_3ds.Map(data)
             barrier_height = spec.get_apparent_barrier_height_map ()[0]
             vmin, vmax = self.get_3sigma_limits(barrier_height)
             im = ax.imshow(barrier_height, origin=origin, vmin=vmin, vmax=vmax, 
-                        aspect=params['aspect_ratio'], cmap=bwr, interpolation='none')
+                        aspect=params['aspect_ratio'], cmap=self._bwr, interpolation='none')
 
             # colorbar 추가
-            plt.draw()
-            posn = ax.get_position()
-            cax = fig.add_axes([posn.x1 + 0.01, posn.y0, 0.02, posn.height])
-            cbar = plt.colorbar(im, cax=cax)
+            cax = ax.inset_axes([1.02, 0, 0.04, 1])  # aspect 적용 후의 axes 위치를 따라감
+            cbar = fig.colorbar(im, cax=cax)
             cbar.formatter.set_powerlimits((-3, 4))  # scientific notation 사용 범위 설정
             cbar.update_ticks()
 
             # figure를 이미지로 저장
-            img_stream3 = io.BytesIO()
-            plt.savefig(img_stream3, format='png', bbox_inches='tight', pad_inches=0.01)
-            img_stream3.seek(0)
-            # plt.close('all')
+            img_stream3 = self._savefig_cropped(fig)
 
             return img_stream1, img_stream2, img_stream3
 
         # For STS grid,
         else:
             # 첫 번째 이미지 (topography)
-            fig = plt.figure(figsize=figsize)
-            ax = fig.add_subplot(111)      
+            fig = Figure(figsize=figsize)
+            ax = fig.subplots(gridspec_kw=_MAP_LAYOUT)
             topo = nr.nanonis_3ds.Topo(data)
             z_data = topo.get_z ('subtract linear fit')
             origin = 'lower'
             vmin, vmax = self.get_3sigma_limits(z_data)
-            nanox = nr.cmap_custom.nanox()
-            bwr = nr.cmap_custom.bwr()
             
             # 이미지 플롯
             im = ax.imshow(z_data, origin=origin, vmin=vmin, vmax=vmax, 
-                        aspect=params['aspect_ratio'], cmap=nanox, interpolation='none')
+                        aspect=params['aspect_ratio'], cmap=self._nanox, interpolation='none')
 
             # colorbar 추가
-            plt.draw()
-            posn = ax.get_position()
-            cax = fig.add_axes([posn.x1 + 0.01, posn.y0, 
-                                0.02, posn.height])
-            plt.colorbar(im, cax=cax)
+            cax = ax.inset_axes([1.02, 0, 0.04, 1])  # aspect 적용 후의 axes 위치를 따라감
+            fig.colorbar(im, cax=cax)
 
             # figure를 이미지로 저장
-            img_stream1 = io.BytesIO()
-            plt.savefig(img_stream1, format='png', bbox_inches='tight', pad_inches=0.01)
-            img_stream1.seek(0)
-            # plt.close('all')
+            img_stream1 = self._savefig_cropped(fig)
 
             # 두 번째 이미지 (dI/dV map)
-            fig = plt.figure(figsize=figsize)
-            ax = fig.add_subplot(111)
+            fig = Figure(figsize=figsize)
+            ax = fig.subplots(gridspec_kw=_MAP_LAYOUT)
             spec = nr.nanonis_3ds.Map(data)
 
             idx = (nearest (spec.signals['sweep_signal'], -0.3)[0] or
@@ -870,21 +902,16 @@ class DataToPPT:
             didvmap = spec.get_didvmap (sweep_idx=idx)
             vmin, vmax = self.get_3sigma_limits(didvmap)
             im = ax.imshow(didvmap, origin=origin, vmin=vmin, vmax=vmax, 
-                        aspect=params['aspect_ratio'], cmap=bwr, interpolation='none')
+                        aspect=params['aspect_ratio'], cmap=self._bwr, interpolation='none')
 
             # colorbar 추가
-            plt.draw()
-            posn = ax.get_position()
-            cax = fig.add_axes([posn.x1 + 0.01, posn.y0, 0.02, posn.height])
-            cbar = plt.colorbar(im, cax=cax)
+            cax = ax.inset_axes([1.02, 0, 0.04, 1])  # aspect 적용 후의 axes 위치를 따라감
+            cbar = fig.colorbar(im, cax=cax)
             cbar.formatter.set_powerlimits((-3, 4))  # scientific notation 사용 범위 설정
             cbar.update_ticks()
 
             # figure를 이미지로 저장
-            img_stream2 = io.BytesIO()
-            plt.savefig(img_stream2, format='png', bbox_inches='tight', pad_inches=0.01)
-            img_stream2.seek(0)
-            # plt.close('all')
+            img_stream2 = self._savefig_cropped(fig)
 
             # # 세 번째 이미지 (individual and average STS curves)
             # fig = plt.figure(figsize=figsize)
@@ -910,8 +937,7 @@ class DataToPPT:
             # # plt.close('all')
 
             # Average STS
-            fig = plt.figure(figsize=figsize)
-            ax = fig.add_subplot(111)
+            ax = self._line_axes()
             spec = nr.nanonis_3ds.PtSpec(data)
             lines, pixels = np.shape(z_data)
 
@@ -925,126 +951,134 @@ class DataToPPT:
             v = spec.get_didv_raw(0, 0, channel='LI Demod 1 X (A)')[0]
 
             # 모든 곡선을 한 번에 플롯
-            plt.plot(v, np.array(didv_data).T * 1e9, 'k-', alpha=0.2, lw=0.2)
+            ax.plot(v, np.array(didv_data).T * 1e9, 'k-', alpha=0.2, lw=0.2)
 
             # 평균 곡선 계산 및 플롯
             didv_avg = np.nanmean(didv_data, axis=0)
-            plt.plot(v, didv_avg * 1e9, 'r-')
+            ax.plot(v, didv_avg * 1e9, 'r-')
 
-            plt.xlabel('Bias (V)')
-            plt.ylabel('dI/dV (a.u.)')
-            img_stream3 = io.BytesIO()
-            plt.savefig(img_stream3, format='png', bbox_inches='tight', pad_inches=0.1)
-            img_stream3.seek(0)
-            # plt.close('all')
+            ax.set_xlabel('Bias (V)')
+            ax.set_ylabel('dI/dV (a.u.)')
+            img_stream3 = self._savefig(self._fig)
 
             return img_stream1, img_stream2, img_stream3
-        
-        img_stream = io.BytesIO()
-        plt.savefig(img_stream, format='png', bbox_inches='tight')
-        img_stream.seek(0)
-        # plt.close('all')
-        return img_stream
     
 
-    def add_slide(self, data):
+    def _render(self, data):
         '''
-        데이터를 처리하고 슬라이드에 추가하는 함수
+        데이터를 처리하여 슬라이드 내용(이미지, 정보 텍스트)을 반환하는 함수
+        pptx 객체를 건드리지 않으므로 worker process에서 실행 가능
+        '''
+        # 파일 확장자에 따른 처리
+        _, extension = os.path.splitext(data.fname)
+        if extension not in self._handlers:
+            raise ValueError(f"Unsupported file type: {data.fname}")
+        get_parameters, process_file, get_info_text = self._handlers[extension]
+
+        params = get_parameters(data)
+        img_streams = process_file(data, params)
+        info_text = get_info_text(params)
+
+        if not isinstance(img_streams, tuple):
+            img_streams = (img_streams,)
+
+        return {
+            'fname': data.fname,
+            'img_streams': img_streams,
+            'info_text': info_text,
+        }
+
+    def _emplace(self, payload):
+        '''
+        _render 결과를 새 슬라이드에 추가하는 함수 (main process에서만 실행)
         '''
         # 새 슬라이드 추가
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[5])  # 빈 슬라이드
+        slide = self.prs.slides.add_slide(self._title_only_layout)  # 빈 슬라이드
         
         # 제목 추가
         title_shape = slide.shapes.title
-        title_shape.text = f"File: {data.fname}"
-        
-        # 파일 확장자에 따른 처리
-        if data.fname.endswith('.sxm'):
-            params = self.get_scan_parameters(data)
-            
-            base_size = 3.2  # 이미지 크기를 조금 줄여서 3개가 들어갈 수 있게 조정
-            width = Inches(base_size)
-            height = Inches(base_size)
-            img_top = Inches(1.5)
-            
-            img_streams = self.process_sxm_file(data)
-            if not isinstance(img_streams, tuple):
-                img_streams = (img_streams,)
-            for i, img_stream in enumerate(img_streams):
-                x_position = Inches(0 + base_size * 1.02 * i)
-                slide.shapes.add_picture(img_stream, x_position, img_top, width=width)
+        title_shape.text = f"File: {payload['fname']}"
 
-            text_top = img_top + height + Inches(0.2)  # 0.2인치 간격
-            info_text = self.get_sxm_info_text(params)
+        for i, img in enumerate(payload['img_streams']):
+            # PNG bytes는 add_picture 직전에만 file 객체로 감싸기
+            slide.shapes.add_picture(io.BytesIO(img), _SLIDE_IMG_STEP * i, _SLIDE_IMG_TOP, width=_SLIDE_IMG_SIZE)
 
-        elif data.fname.endswith('.dat'):
-            params = self.get_dat_parameters(data)
-            
-            base_size = 3.2
-            width = Inches(base_size)
-            height = Inches(base_size)
-            img_top = Inches(1.5)
-
-            img_streams = self.process_dat_file(data)
-            if not isinstance(img_streams, tuple):
-                img_streams = (img_streams,)
-            for i, img_stream in enumerate(img_streams):
-                x_position = Inches(0 + base_size * 1.02 * i)
-                slide.shapes.add_picture(img_stream, x_position, img_top, width=width)
-                
-
-            text_top = img_top + height + Inches(0.2)  # 0.2인치 간격
-            info_text = self.get_dat_info_text(params)
-            
-        elif data.fname.endswith('.3ds'):
-            params = self.get_3ds_parameters(data)
-            # info_text = self.get_3ds_info_text(params)
-            # text_top = Inches(6)
-            # img_stream = self.process_3ds_file(data)
-            base_size = 3.2
-            width = Inches(base_size)
-            height = Inches(base_size)
-            img_top = Inches(1.5)
-
-            img_streams = self.process_3ds_file(data)
-            if not isinstance(img_streams, tuple):
-                img_streams = (img_streams,)
-            for i, img_stream in enumerate(img_streams):
-                x_position = Inches(0 + base_size * 1.02 * i)
-                slide.shapes.add_picture(img_stream, x_position, img_top, width=width)
-                
-
-            text_top = img_top + height + Inches(0.2)  # 0.2인치 간격
-            info_text = self.get_3ds_info_text(params)
+        info_text = payload['info_text']
         
         # 추가 정보 텍스트 박스
         # left, top, width, height
-        txBox = slide.shapes.add_textbox(Inches(1), text_top,
-                                    Inches(8), Inches(0.5))
+        txBox = slide.shapes.add_textbox(_SLIDE_TEXT_LEFT, _SLIDE_TEXT_TOP,
+                                    _SLIDE_TEXT_WIDTH, _SLIDE_TEXT_HEIGHT)
         tf = txBox.text_frame
         tf.text = info_text if info_text else "No parameters available"
 
+    def add_slide(self, data):
+        '''
+        데이터를 처리하고 슬라이드에 추가하는 함수
+        '''
+        self._emplace(self._render(data))
+
     def find_max_file_number(self):
         '''
-        현재 경로에서 가장 큰 파일 번호 찾기
+        현재 경로에서 가장 큰 파일 번호 찾기 (scan_files와 같은 기준으로 번호 추출)
         '''
-        import glob
-        import os
+        return max(self.scan_files(), default=0)
 
-        pattern = os.path.join(self.base_path, f'*{self.keyword if self.keyword else ""}*.*')
-        files = glob.glob(pattern)
-        
-        max_num = 0
-        for file in files:
-            try:
-                # 파일 이름에서 숫자 추출
-                num_str = file.split('_')[-1].split('.')[0]
-                num = int(num_str)
-                max_num = max(max_num, num)
-            except:
-                continue
-                
-        return max_num
+    def scan_files(self):
+        '''
+        base_path를 한 번만 탐색하여 {파일 번호 (int): [파일 경로, ...]} dict 반환
+        (keyword는 NanonisData의 '*keyword*_번호.*' 검색과 같이 번호 앞부분에서만 찾음)
+        '''
+        entries = {}
+        with os.scandir(self.base_path) as it:
+            for entry in it:
+                # 숨김 파일 (ex: macOS의 '._Au111_0001.dat')은 glob의 '*'처럼 제외
+                if entry.name.startswith('.') or not entry.is_file():
+                    continue
+                match = _NUMBER_RE.search(entry.name)
+                if match is None:
+                    continue
+                if self.keyword and self.keyword not in entry.name[:match.start()]:
+                    continue
+                entries.setdefault(int(match.group(1)), []).append(entry.path)
+        for paths in entries.values():
+            paths.sort()
+        return entries
+
+    def _add_slides_parallel(self, filepaths):
+        '''
+        파일 로드 및 이미지 생성은 worker process에서 병렬로 실행하고,
+        슬라이드 추가는 파일 번호 순서대로 main process에서 실행 (pptx는 process 간 공유 불가)
+        반환값: worker가 비정상 종료되어 (BrokenProcessPool) 슬라이드를 추가하지 못한 (번호, 파일 경로) list
+        '''
+        done = set()
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(type(self), self.base_path, self.keyword)) as executor:
+                futures = []
+                try:
+                    for i, filepath in filepaths:
+                        futures.append((i, executor.submit(_render_from_path, filepath)))
+                    for i, future in futures:
+                        try:
+                            payload = future.result()
+                        except ValueError as e:
+                            print(f"Skipping number {i}: {str(e)}")
+                            done.add(i)
+                            continue
+                        print(f"Processing file: {payload['fname']}")
+                        
+                        # 슬라이드 추가
+                        self._emplace(payload)
+                        done.add(i)
+                except BaseException:
+                    # ValueError 외의 예외는 바로 전달 (executor 종료시 남은 파일을 모두 처리할 때까지 기다리지 않도록 대기 중인 작업 취소)
+                    for _, future in futures:
+                        future.cancel()
+                    raise
+        except BrokenProcessPool:
+            print("Warning: Worker process terminated abruptly. Processing remaining files in the main process")
+        return [(i, filepath) for i, filepath in filepaths if i not in done]
 
     def generate_ppt(self):
         '''
@@ -1088,25 +1122,63 @@ class DataToPPT:
             return
             
         print(f"\nGenerating PPT for files {start} to {end}...")
+
+        # 디렉토리는 한 번만 탐색하고, 범위 안에 실제로 있는 번호만 처리
+        entries = self.scan_files()
+        present = sorted(i for i in entries if start <= i <= end)
+        print(f"Found {len(present)} files in range {start} to {end}")
+        filepaths = []
         
-        for i in range(start, end + 1):
+        for i in present:
+            paths = entries[i]
+            if len(paths) > 1:
+                print("Warning: Multiple files found. Files found:")
+                for f in paths:
+                    print(f"- {os.path.basename(f)}")
+                print(f"Using the first one: {os.path.basename(paths[0])}")
+            filepaths.append((i, paths[0]))
+
+        # max_workers가 2 이상이면 worker process에서 병렬로 이미지 생성,
+        # 아니면 (또는 pool이 비정상 종료되어 남은 파일은) main process에서 순서대로 처리
+        if self.max_workers is not None and self.max_workers > 1:
+            filepaths = self._add_slides_parallel(filepaths)
+        for i, filepath in filepaths:
             try:
-                # 파일 로드
-                data = NanonisData(self.base_path, i, self.keyword)
-                print(f"Processing file: {data.fname}")
-                
-                # 슬라이드 추가
-                self.add_slide(data)
-                plt.close('all')
-                
+                payload = self._render(NanonisData.from_path(filepath))
             except ValueError as e:
                 print(f"Skipping number {i}: {str(e)}")
-                plt.close('all')
                 continue
+            print(f"Processing file: {payload['fname']}")
+            
+            # 슬라이드 추가
+            self._emplace(payload)
         
         # PPT 저장
-        save_path = self.base_path + 'PPT/'
-        if not os.path.exists(save_path):
-            os.makedirs(save_path)
-        self.prs.save(save_path + self.output_filename)
-        print(f"\nPPT has been saved as {save_path + self.output_filename}")
\ No newline at end of file
+        save_path = os.path.join(self.base_path, 'PPT')
+        os.makedirs(save_path, exist_ok=True)
+        output_path = os.path.join(save_path, self.output_filename)
+        self.prs.save(output_path)
+        print(f"\nPPT has been saved as {output_path}")
+
+
+# worker process마다 하나씩 생성되는 렌더링 전용 DataToPPT
+_worker = None
+
+def _init_worker(cls, base_path, keyword):
+    '''
+    ProcessPoolExecutor worker 초기화 함수
+    cls: generate_ppt를 호출한 class (subclass에서 override한 함수도 worker에서 그대로 사용)
+    '''
+    global _worker
+    import matplotlib
+    matplotlib.use('Agg')  # worker에서는 화면 출력 없이 이미지 생성만
+    _worker = cls(base_path, keyword)
+
+def _render_from_path(filepath):
+    '''
+    worker process에서 파일을 로드하고 슬라이드 내용을 반환
+    '''
+    try:
+        return _worker._render(NanonisData.from_path(filepath))
+    finally:
+        plt.close('all')  # 처리 도중 예외가 발생하여 닫히지 않은 figure 정리